@@ -1,6 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, tuple_
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from dotenv import load_dotenv
 import os
 
@@ -8,8 +11,29 @@ load_dotenv()
 
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./esports.db")
 
+database_url = make_url(SQLALCHEMY_DATABASE_URL)
+is_sqlite = database_url.get_backend_name() == "sqlite"
+
+# Pool sizes are per process; with several workers keep
+# DB_POOL_SIZE + DB_MAX_OVERFLOW <= database max connections / workers.
+# In-memory SQLite uses SingletonThreadPool, which takes no sizing options.
+is_memory_sqlite = is_sqlite and (
+    database_url.database in (None, "", ":memory:") or database_url.query.get("mode") == "memory"
+)
+pool_args = {}
+if not is_memory_sqlite:
+    pool_args = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "5"))
+    }
+
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False} if is_sqlite else {},
+    pool_pre_ping=True,
+    echo=False,
+    **pool_args
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -20,4 +44,48 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+def upsert(db, model, rows, index_elements=("external_id",)):
+    """Insert rows in a single statement, updating rows that already exist"""
+    if not rows:
+        return
+    
+    # Postgres rejects a statement that touches the same row twice
+    rows = list({tuple(row[key] for key in index_elements): row for row in rows}.values())
+    
+    dialect = db.get_bind().dialect.name
+    if dialect not in ("postgresql", "sqlite"):
+        _upsert_batched(db, model, rows, index_elements)
+        return
+    
+    insert = pg_insert if dialect == "postgresql" else sqlite_insert
+    stmt = insert(model).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(index_elements),
+        set_={key: stmt.excluded[key] for key in rows[0] if key not in index_elements}
+    )
+    db.execute(stmt)
+
+def _upsert_batched(db, model, rows, index_elements):
+    """Fallback for dialects without ON CONFLICT: one IN query, then update or add"""
+    columns = [getattr(model, key) for key in index_elements]
+    if len(columns) == 1:
+        keys = [row[index_elements[0]] for row in rows]
+        query = db.query(model).filter(columns[0].in_(keys))
+    else:
+        keys = [tuple(row[key] for key in index_elements) for row in rows]
+        query = db.query(model).filter(tuple_(*columns).in_(keys))
+    
+    existing = {
+        tuple(getattr(obj, key) for key in index_elements): obj
+        for obj in query.all()
+    }
+    
+    for row in rows:
+        obj = existing.get(tuple(row[key] for key in index_elements))
+        if obj:
+            for key, value in row.items():
+                setattr(obj, key, value)
+        else:
+            db.add(model(**row))
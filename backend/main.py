@@ -1,26 +1,56 @@
-from fastapi import FastAPI, Depends, HTTPException, Query, Request
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import os
-from datetime import datetime
+import asyncio
+import ciso8601
 import logging
+import queue
+import atexit
+from logging.handlers import QueueHandler, QueueListener
+import anyio
+from contextlib import asynccontextmanager
 
-from database import get_db, engine
+from database import get_db, engine, upsert, SessionLocal
 from models import Base, Tournament, Team
+from schemas import TournamentsResponse, TeamsResponse
 from services.pandascore import PandaScoreAPI
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging; records are queued and written by a background thread
+# so request handlers never block on stream I/O
+log_queue = queue.SimpleQueue()
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+log_listener = QueueListener(log_queue, log_handler)
+# The listener's handler does the formatting; the queue handler passes the message through
+queue_handler = QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+# Runs for the life of the process, not per lifespan, so repeated startups keep logging
+log_listener.start()
+atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Blocking DB work runs in the threadpool; raise anyio's default of 40 threads
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 100
+    yield
+    # Release pooled PandaScore connections on shutdown
+    await pandascore.aclose()
+
 app = FastAPI(
     title="Esports Tournament Tracker API",
     description="API for tracking esports tournaments, teams, and matches",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS with more specific settings
@@ -40,15 +70,32 @@ app.add_middleware(
     max_age=3600,  # Cache preflight requests for 1 hour
 )
 
+# Compress larger responses such as the tournament and team lists
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Initialize PandaScore API client
 pandascore = PandaScoreAPI()
 
+def persist_rows(model, rows) -> None:
+    """
+    Upsert rows in one transaction. Runs as a background task after the
+    response is sent, so it uses its own session rather than the request's.
+    """
+    if not rows:
+        # Nothing to write, skip the transaction round-trip
+        return
+    try:
+        with SessionLocal() as db, db.begin():
+            upsert(db, model, rows)
+    except Exception as e:
+        logger.error("Database error while saving %s: %s", model.__tablename__, e)
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Log all incoming requests"""
-    logger.info(f"Request: {request.method} {request.url}")
+    """Log all incoming requests, except successful hits on the root endpoint"""
     response = await call_next(request)
-    logger.info(f"Response: {response.status_code}")
+    if request.url.path != "/" or response.status_code >= 400:
+        logger.info("%s %s -> %s", request.method, request.url, response.status_code)
     return response
 
 @app.get("/")
@@ -63,15 +110,15 @@ async def read_root():
         }
     }
 
-@app.get("/tournaments")
+@app.get("/tournaments", response_model=TournamentsResponse, response_model_exclude_unset=True)
 async def get_tournaments(
+    background_tasks: BackgroundTasks,
     game: Optional[str] = Query(None, description="Filter tournaments by game (e.g., lol, marvel-rivals)"),
-    status: Optional[str] = Query("running,upcoming", description="Filter by tournament status"),
-    db: Session = Depends(get_db)
+    status: Optional[str] = Query("running,upcoming", description="Filter by tournament status")
 ):
     try:
         # Log the incoming request parameters
-        logger.info(f"Fetching tournaments with game={game}, status={status}")
+        logger.info("Fetching tournaments with game=%s, status=%s", game, status)
         
         if game and game not in pandascore.SUPPORTED_GAMES:
             raise HTTPException(
@@ -80,94 +127,64 @@ async def get_tournaments(
             )
         
         # Fetch tournaments from PandaScore
-        tournaments_data = pandascore.get_tournaments(game=game, status=status)
-        logger.info(f"Retrieved {len(tournaments_data)} tournaments from PandaScore")
+        tournaments_data = await pandascore.get_tournaments(game=game, status=status)
+        logger.info("Retrieved %d tournaments from PandaScore", len(tournaments_data))
         
-        # Process each tournament
-        processed_tournaments = []
+        # Build rows for a single bulk upsert
+        tournament_rows = []
         for t_data in tournaments_data:
             # Handle potential missing or null values
             begin_at = t_data.get("begin_at")
             end_at = t_data.get("end_at")
             
-            # Create tournament object with processed data
-            tournament_dict = {
+            tournament_rows.append({
                 "external_id": str(t_data["id"]),
                 "name": t_data.get("name", "Unnamed Tournament"),
                 "game": t_data.get("videogame", {}).get("name", "Unknown Game"),
-                "start_date": datetime.fromisoformat(begin_at.replace('Z', '+00:00')) if begin_at else None,
-                "end_date": datetime.fromisoformat(end_at.replace('Z', '+00:00')) if end_at else None,
+                "start_date": ciso8601.parse_datetime(begin_at) if begin_at else None,
+                "end_date": ciso8601.parse_datetime(end_at) if end_at else None,
                 "status": t_data.get("status", "unknown"),
                 "prize_pool": t_data.get("prize_pool", "")
-            }
-            
-            # Check if tournament already exists
-            existing_tournament = db.query(Tournament).filter(
-                Tournament.external_id == tournament_dict["external_id"]
-            ).first()
-            
-            if existing_tournament:
-                # Update existing tournament
-                for key, value in tournament_dict.items():
-                    setattr(existing_tournament, key, value)
-                tournament = existing_tournament
-            else:
-                # Create new tournament
-                tournament = Tournament(**tournament_dict)
-                db.add(tournament)
-            
-            processed_tournaments.append(tournament)
+            })
         
-        # Commit all changes at once
-        try:
-            db.commit()
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Database error while saving tournaments: {str(e)}")
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to save tournaments to database"
-            )
+        # Save to the database once the response has been sent
+        background_tasks.add_task(persist_rows, Tournament, tournament_rows)
         
         return {"tournaments": tournaments_data}
     
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        logger.error(f"Error in get_tournaments: {str(e)}")
+        logger.error("Error in get_tournaments: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch tournaments: {str(e)}"
         )
 
-@app.get("/teams")
+@app.get("/teams", response_model=TeamsResponse, response_model_exclude_unset=True)
 async def get_teams(
-    game: Optional[str] = Query(None, description="Filter teams by game"),
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    game: Optional[str] = Query(None, description="Filter teams by game")
 ):
     try:
         # Fetch teams from PandaScore
-        teams_data = pandascore.get_teams(game=game)
-        
-        # Convert and save to database
-        teams = []
-        for t_data in teams_data:
-            team = Team(
-                external_id=str(t_data["id"]),
-                name=t_data.get("name", "Unnamed Team"),
-                acronym=t_data.get("acronym", ""),
-                image_url=t_data.get("image_url", ""),
-                game=t_data.get("current_videogame", {}).get("name", "Unknown Game")
-            )
-            db.merge(team)
-            teams.append(team)
+        teams_data = await pandascore.get_teams(game=game)
         
-        db.commit()
+        # Convert and save to the database once the response has been sent
+        team_rows = [
+            {
+                "external_id": str(t_data["id"]),
+                "name": t_data.get("name", "Unnamed Team"),
+                "acronym": t_data.get("acronym", ""),
+                "image_url": t_data.get("image_url", ""),
+                "game": t_data.get("current_videogame", {}).get("name", "Unknown Game")
+            }
+            for t_data in teams_data
+        ]
+        background_tasks.add_task(persist_rows, Team, team_rows)
         return {"teams": teams_data}
     
     except Exception as e:
-        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch teams: {str(e)}"
@@ -180,7 +197,7 @@ async def get_match_prediction(
 ):
     try:
         # Fetch match data from PandaScore
-        match_data = pandascore.get_matches(match_id)
+        match_data = await pandascore.get_matches(match_id)
         
         if not match_data:
             raise HTTPException(
@@ -214,26 +231,24 @@ async def get_tournament_details(
     db: Session = Depends(get_db)
 ):
     try:
-        # Fetch tournament details from PandaScore
-        tournament_data = pandascore.get_tournament(tournament_id)
+        # Fetch tournament details and its matches from PandaScore concurrently
+        tournament_data, matches = await asyncio.gather(
+            pandascore.get_tournament(tournament_id),
+            pandascore.get_matches(tournament_id=tournament_id)
+        )
         if not tournament_data:
             raise HTTPException(
                 status_code=404,
                 detail=f"Tournament with ID {tournament_id} not found"
             )
         
-        # Fetch matches for this tournament
-        matches = pandascore.get_matches(tournament_id=tournament_id)
-        
-        # Enhance tournament data with matches
-        tournament_data["matches"] = matches
-        
-        return tournament_data
+        # Enhance tournament data with matches (copy, the cached payload is shared)
+        return {**tournament_data, "matches": matches}
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in get_tournament_details: {str(e)}")
+        logger.error("Error in get_tournament_details: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch tournament details: {str(e)}"
@@ -247,7 +262,7 @@ async def create_prediction(
 ):
     try:
         # TODO: Validate match exists and is not finished
-        match_data = pandascore.get_match(match_id)
+        match_data = await pandascore.get_match(match_id)
         if not match_data:
             raise HTTPException(
                 status_code=404,
@@ -271,7 +286,7 @@ async def create_prediction(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in create_prediction: {str(e)}")
+        logger.error("Error in create_prediction: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to create prediction: {str(e)}"
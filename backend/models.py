@@ -9,7 +9,7 @@ class Tournament(Base):
     __tablename__ = "tournaments"
 
     id = Column(Integer, primary_key=True)
-    external_id = Column(String, unique=True)
+    external_id = Column(String, unique=True, index=True, nullable=False)
     name = Column(String)
     game = Column(String)
     start_date = Column(DateTime)
@@ -22,7 +22,7 @@ class Team(Base):
     __tablename__ = "teams"
 
     id = Column(Integer, primary_key=True)
-    external_id = Column(String, unique=True)
+    external_id = Column(String, unique=True, index=True, nullable=False)
     name = Column(String)
     acronym = Column(String)
     image_url = Column(String)
@@ -0,0 +1,34 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List, Dict, Any
+
+# Response models for the list endpoints. Declaring them lets FastAPI
+# serialize responses with pydantic-core instead of walking every nested
+# dict in Python. Extra PandaScore fields are passed through unchanged.
+
+class TournamentOut(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    id: int
+    name: Optional[str] = None
+    slug: Optional[str] = None
+    status: Optional[str] = None
+    begin_at: Optional[str] = None
+    end_at: Optional[str] = None
+    videogame: Optional[Dict[str, Any]] = None
+    league: Optional[Dict[str, Any]] = None
+
+class TournamentsResponse(BaseModel):
+    tournaments: List[TournamentOut]
+
+class TeamOut(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    id: int
+    name: Optional[str] = None
+    acronym: Optional[str] = None
+    image_url: Optional[str] = None
+    current_videogame: Optional[Dict[str, Any]] = None
+    players: Optional[List[Dict[str, Any]]] = None
+
+class TeamsResponse(BaseModel):
+    teams: List[TeamOut]
@@ -0,0 +1,48 @@
+import asyncio
+import functools
+import time
+from typing import Any, Callable, Dict, Tuple
+
+
+def ttl_cache(ttl: float) -> Callable:
+    """
+    Cache the results of an async function for `ttl` seconds.
+
+    Concurrent calls with the same arguments share a single in-flight call
+    instead of each hitting the upstream API. Failed calls are not cached.
+    """
+    def decorator(func: Callable) -> Callable:
+        entries: Dict[Tuple, Tuple[float, Any]] = {}
+        in_flight: Dict[Tuple, asyncio.Future] = {}
+
+        def _store(key: Tuple, task: asyncio.Future) -> None:
+            in_flight.pop(key, None)
+            if task.cancelled() or task.exception() is not None:
+                return
+            now = time.monotonic()
+            # Drop expired entries so rarely repeated keys don't pile up
+            for stale_key in [k for k, (expires_at, _) in entries.items() if expires_at <= now]:
+                del entries[stale_key]
+            entries[key] = (now + ttl, task.result())
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+
+            entry = entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+
+            # No await between the lookup and registering the task, so
+            # callers on the same event loop can't race each other here
+            task = in_flight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(func(*args, **kwargs))
+                in_flight[key] = task
+                task.add_done_callback(functools.partial(_store, key))
+
+            # Shield so one cancelled caller doesn't cancel the shared call
+            return await asyncio.shield(task)
+
+        return wrapper
+    return decorator
@@ -1,9 +1,13 @@
 import os
-import requests
+import asyncio
+import httpx
+import orjson
 from dotenv import load_dotenv
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
+from services.cache import ttl_cache
+
 load_dotenv()
 
 class PandaScoreAPI:
@@ -12,6 +16,21 @@ class PandaScoreAPI:
         "lol": "league-of-legends",
         "valorant": "valorant"
     }
+    # Games with a dedicated tournaments endpoint
+    GAME_ENDPOINTS = {
+        "lol": "/lol/tournaments",
+        "valorant": "/valorant/tournaments"
+    }
+    # Upper bound on concurrent per-team requests fired by get_teams
+    MAX_CONCURRENT_TEAM_REQUESTS = 10
+    # Team fields kept on each match opponent by get_matches
+    OPPONENT_FIELDS = ("id", "name", "image_url", "acronym")
+    # Number of responses kept for ETag revalidation
+    ETAG_CACHE_SIZE = 256
+    # Connection pool settings for the shared HTTP client
+    REQUEST_TIMEOUT = 10.0
+    MAX_CONNECTIONS = 100
+    MAX_KEEPALIVE_CONNECTIONS = 20
     
     def __init__(self):
         self.api_key = os.getenv("PANDASCORE_API_KEY")
@@ -22,8 +41,60 @@ class PandaScoreAPI:
             "Authorization": f"Bearer {self.api_key}",
             "Accept": "application/json"
         }
+        
+        # orjson parses PandaScore's nested payloads much faster than stdlib json
+        self._loads = orjson.loads
+        # (ETag, body) of the last response per endpoint and params
+        self._etags: Dict[tuple, tuple] = {}
+        
+        # Created on first use and rebuilt after aclose(), so a later lifespan
+        # in the same process doesn't reuse a closed client
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared keep-alive client, recreated if it was closed by a previous shutdown"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.BASE_URL,
+                headers=self.headers,
+                http2=True,
+                timeout=self.REQUEST_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=self.MAX_CONNECTIONS,
+                    max_keepalive_connections=self.MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
+        return self._client
     
-    def get_tournaments(self, game: Optional[str] = None, status: str = "running,upcoming", per_page: int = 50) -> List[Dict[Any, Any]]:
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client and its pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def _get_content(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+        """GET an endpoint and return the raw body, revalidating with If-None-Match"""
+        cache_key = (endpoint, tuple(sorted((params or {}).items())))
+        cached = self._etags.get(cache_key)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        
+        response = await self.client.get(endpoint, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            return cached[1]
+        response.raise_for_status()
+        
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etags.pop(cache_key, None)
+            if len(self._etags) >= self.ETAG_CACHE_SIZE:
+                # Evict the oldest entry
+                del self._etags[next(iter(self._etags))]
+            self._etags[cache_key] = (etag, response.content)
+        return response.content
+    
+    @ttl_cache(ttl=60)
+    async def get_tournaments(self, game: Optional[str] = None, status: str = "running,upcoming", per_page: int = 50) -> List[Dict[Any, Any]]:
         """
         Fetch tournaments with enhanced game-specific data
         """
@@ -31,41 +102,37 @@ class PandaScoreAPI:
             raise ValueError(f"Unsupported game. Supported games are: {', '.join(self.SUPPORTED_GAMES.keys())}")
             
         # Use game-specific endpoints for better filtering
-        if game == "lol":
-            endpoint = f"{self.BASE_URL}/lol/tournaments"
-        elif game == "valorant":
-            endpoint = f"{self.BASE_URL}/valorant/tournaments"
-        else:
-            endpoint = f"{self.BASE_URL}/tournaments"
+        endpoint = self.GAME_ENDPOINTS.get(game, "/tournaments")
             
         params = {
             "per_page": per_page,
             "status": status
         }
         
-        if game and game not in ["lol", "valorant"]:  # Only add videogame param for general endpoint
+        if game and game not in self.GAME_ENDPOINTS:  # Only add videogame param for general endpoint
             params["videogame"] = self.SUPPORTED_GAMES[game]
             
-        response = requests.get(endpoint, headers=self.headers, params=params)
-        response.raise_for_status()
-        tournaments = response.json()
+        tournaments = self._loads(await self._get_content(endpoint, params=params))
         
         # Filter tournaments to ensure they match the requested game
+        target_slug = self.SUPPORTED_GAMES.get(game)
+        if not target_slug and not any("league" in t or "series" in t for t in tournaments):
+            # Nothing to filter or enhance, return the payload as is
+            return tournaments
+        
         filtered_tournaments = []
         for tournament in tournaments:
-            videogame = tournament.get("videogame", {})
-            game_slug = videogame.get("slug") if isinstance(videogame, dict) else None
-            
             # Only include tournaments that match the requested game
-            if game and game in self.SUPPORTED_GAMES:
-                if game_slug != self.SUPPORTED_GAMES[game]:
+            if target_slug:
+                videogame = tournament.get("videogame", {})
+                game_slug = videogame.get("slug") if isinstance(videogame, dict) else None
+                if game_slug != target_slug:
                     continue
             
-            enhanced_tournament = tournament.copy()
-            
+            # Freshly parsed payload, so enhance it in place rather than copying
             # Add league info if available
             if "league" in tournament:
-                enhanced_tournament["league_info"] = {
+                tournament["league_info"] = {
                     "name": tournament["league"].get("name"),
                     "image_url": tournament["league"].get("image_url"),
                     "region": tournament["league"].get("region")
@@ -73,35 +140,36 @@ class PandaScoreAPI:
             
             # Add series info if available
             if "series" in tournament:
-                enhanced_tournament["series_info"] = {
+                tournament["series_info"] = {
                     "name": tournament["series"].get("name"),
                     "season": tournament["series"].get("season")
                 }
             
             # Add game-specific details
             if game == "lol":
-                enhanced_tournament["game_details"] = {
+                tournament["game_details"] = {
                     "patch_version": tournament.get("patch_version"),
                     "tournament_type": tournament.get("tournament_type", "Unknown"),
                     "region": tournament.get("region", "International")
                 }
             elif game == "valorant":
-                enhanced_tournament["game_details"] = {
+                tournament["game_details"] = {
                     "patch": tournament.get("patch", "Unknown"),
                     "series_type": tournament.get("serie_type", "Unknown"),
                     "region": tournament.get("region", "International")
                 }
             
-            filtered_tournaments.append(enhanced_tournament)
+            filtered_tournaments.append(tournament)
         
         return filtered_tournaments
     
-    def get_teams(self, game: Optional[str] = None, per_page: int = 50) -> List[Dict[Any, Any]]:
+    @ttl_cache(ttl=60)
+    async def get_teams(self, game: Optional[str] = None, per_page: int = 50) -> List[Dict[Any, Any]]:
         """Fetch teams with enhanced statistics"""
         if game and game not in self.SUPPORTED_GAMES:
             raise ValueError(f"Unsupported game. Supported games are: {', '.join(self.SUPPORTED_GAMES.keys())}")
             
-        endpoint = f"{self.BASE_URL}/teams"
+        endpoint = "/teams"
         params = {
             "per_page": per_page
         }
@@ -109,18 +177,25 @@ class PandaScoreAPI:
         if game:
             params["videogame"] = self.SUPPORTED_GAMES[game]
             
-        response = requests.get(endpoint, headers=self.headers, params=params)
-        response.raise_for_status()
-        teams = response.json()
+        teams = self._loads(await self._get_content(endpoint, params=params))
         
-        # Enhance team data
-        enhanced_teams = []
-        for team in teams:
-            enhanced_team = team.copy()
+        # Fetch recent matches for all teams concurrently
+        if game == "lol":
+            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_TEAM_REQUESTS)
+            
+            async def fetch_recent(team):
+                async with semaphore:
+                    return await self.client.get(f"/teams/{team['id']}/matches", params={"per_page": 5})
             
+            recent_responses = await asyncio.gather(*[fetch_recent(team) for team in teams])
+        else:
+            recent_responses = [None] * len(teams)
+        
+        # Enhance team data in place
+        for team, matches_response in zip(teams, recent_responses):
             # Add player roster if available
             if "players" in team:
-                enhanced_team["roster"] = [
+                team["roster"] = [
                     {
                         "name": player.get("name"),
                         "role": player.get("role"),
@@ -131,33 +206,25 @@ class PandaScoreAPI:
                 ]
             
             # Add recent performance
-            if game == "lol":
-                matches_endpoint = f"{self.BASE_URL}/teams/{team['id']}/matches"
-                matches_response = requests.get(matches_endpoint, headers=self.headers, params={"per_page": 5})
-                if matches_response.ok:
-                    recent_matches = matches_response.json()
-                    enhanced_team["recent_performance"] = {
-                        "matches": recent_matches,
-                        "win_rate": self._calculate_win_rate(recent_matches, team['id'])
-                    }
-            
-            enhanced_teams.append(enhanced_team)
+            if matches_response is not None and matches_response.is_success:
+                recent_matches = self._loads(matches_response.content)
+                team["recent_performance"] = {
+                    "matches": recent_matches,
+                    "win_rate": self._calculate_win_rate(recent_matches, team['id'])
+                }
         
-        return enhanced_teams
+        return teams
     
-    def get_tournament(self, tournament_id: str) -> Dict[Any, Any]:
+    @ttl_cache(ttl=300)
+    async def get_tournament(self, tournament_id: str) -> Dict[Any, Any]:
         """Fetch details for a specific tournament"""
-        endpoint = f"{self.BASE_URL}/tournaments/{tournament_id}"
-        response = requests.get(endpoint, headers=self.headers)
-        response.raise_for_status()
-        tournament = response.json()
-        
-        # Enhance tournament data
-        enhanced_tournament = tournament.copy()
+        endpoint = f"/tournaments/{tournament_id}"
+        tournament = self._loads(await self._get_content(endpoint))
         
+        # Enhance tournament data in place
         # Add league info if available
         if "league" in tournament:
-            enhanced_tournament["league_info"] = {
+            tournament["league_info"] = {
                 "name": tournament["league"].get("name"),
                 "image_url": tournament["league"].get("image_url"),
                 "region": tournament["league"].get("region")
@@ -165,7 +232,7 @@ class PandaScoreAPI:
         
         # Add series info if available
         if "series" in tournament:
-            enhanced_tournament["series_info"] = {
+            tournament["series_info"] = {
                 "name": tournament["series"].get("name"),
                 "season": tournament["series"].get("season")
             }
@@ -173,30 +240,30 @@ class PandaScoreAPI:
         # Add game-specific details based on videogame
         videogame = tournament.get("videogame", {})
         if videogame.get("slug") == "league-of-legends":
-            enhanced_tournament["game_details"] = {
+            tournament["game_details"] = {
                 "patch_version": tournament.get("patch_version"),
                 "tournament_type": tournament.get("tournament_type", "Unknown"),
                 "region": tournament.get("region", "International")
             }
         elif videogame.get("slug") == "valorant":
-            enhanced_tournament["game_details"] = {
+            tournament["game_details"] = {
                 "patch": tournament.get("patch", "Unknown"),
                 "series_type": tournament.get("serie_type", "Unknown"),
                 "region": tournament.get("region", "International")
             }
         
-        return enhanced_tournament
+        return tournament
 
-    def get_match(self, match_id: str) -> Dict[Any, Any]:
+    @ttl_cache(ttl=60)
+    async def get_match(self, match_id: str) -> Dict[Any, Any]:
         """Fetch details for a specific match"""
-        endpoint = f"{self.BASE_URL}/matches/{match_id}"
-        response = requests.get(endpoint, headers=self.headers)
-        response.raise_for_status()
-        return response.json()
+        endpoint = f"/matches/{match_id}"
+        return self._loads(await self._get_content(endpoint))
 
-    def get_matches(self, tournament_id: Optional[str] = None, status: str = "running,upcoming", per_page: int = 50) -> List[Dict[Any, Any]]:
+    @ttl_cache(ttl=60)
+    async def get_matches(self, tournament_id: Optional[str] = None, status: str = "running,upcoming", per_page: int = 50) -> List[Dict[Any, Any]]:
         """Fetch matches with detailed statistics"""
-        endpoint = f"{self.BASE_URL}/matches"
+        endpoint = "/matches"
         params = {
             "per_page": per_page,
             "status": status
@@ -205,32 +272,17 @@ class PandaScoreAPI:
         if tournament_id:
             params["tournament_id"] = tournament_id
             
-        response = requests.get(endpoint, headers=self.headers, params=params)
-        response.raise_for_status()
-        matches = response.json()
+        matches = self._loads(await self._get_content(endpoint, params=params))
         
-        # Enhance match data
-        enhanced_matches = []
+        # Trim opponents down to the team fields the frontend uses, in place
         for match in matches:
-            enhanced_match = match.copy()
-            
-            # Add team details
             if "opponents" in match:
-                enhanced_match["opponents"] = [
-                    {
-                        "opponent": {
-                            "id": opponent.get("opponent", {}).get("id"),
-                            "name": opponent.get("opponent", {}).get("name"),
-                            "image_url": opponent.get("opponent", {}).get("image_url"),
-                            "acronym": opponent.get("opponent", {}).get("acronym")
-                        }
-                    }
-                    for opponent in match["opponents"]
+                match["opponents"] = [
+                    {"opponent": {field: team.get(field) for field in self.OPPONENT_FIELDS}}
+                    for team in (opponent.get("opponent", {}) for opponent in match["opponents"])
                 ]
-            
-            enhanced_matches.append(enhanced_match)
         
-        return enhanced_matches
+        return matches
 
     def _calculate_win_rate(self, matches: List[Dict[Any, Any]], team_id: int) -> float:
         """Calculate team's win rate from recent matches"""